@@ -1,111 +1,540 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
 import os
 import json
 import logging
 import time
-from typing import Dict, List, Optional, Any
+import random
+import functools
+import heapq
+import atexit
+import struct
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterator, List, Optional, Any, Tuple
 from queue import Queue
-from threading import Lock
-from groq import Groq
+from threading import Lock, Thread
+import blake3
+import httpx
+import numpy as np
+import orjson
+from tenacity import RetryCallState, Retrying, retry_if_exception, stop_after_attempt
 from src.config import config
 
-# Configure logging
-logging.basicConfig(
-    level=logging.ERROR,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def configure_logging() -> None:
+    """Log errors to app.log and the console; called by entry points, not at import."""
+    logging.basicConfig(
+        level=logging.ERROR,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('app.log'),
+            logging.StreamHandler()
+        ]
+    )
+
+# Free-threading compatible: all shared mutable state in this module
+# (MemoryManager, SemanticCache, GroqClient's exact-match cache) is guarded by its
+# own fine-grained lock, so it is safe on free-threaded (3.13t+) interpreters.
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson for request parsing and jsonify()."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Command prefix for storing a memory, matched case-insensitively
+REMEMBER_PREFIX = "remember: "
+REMEMBER_PREFIX_LEN = len(REMEMBER_PREFIX)
+
+# Sent verbatim as the first message of every request. Keeping these tokens
+# byte-identical across turns lets Groq (or any backend with prefix caching)
+# reuse the KV cache for the prompt prefix instead of re-running prefill on it.
+# Treat as read-only.
+SYSTEM_MSG = {
+    "role": "system",
+    "content": "You are a helpful voice assistant named Jarvis. Your responses should NEVER include any references to previous conversations or questions, even if they are provided in the context. Focus solely on answering the current question directly."
+}
 
 class MemoryManager:
     MAX_HISTORY_SIZE = 50  # Limit conversation history
     MAX_MEMORY_AGE = 3600  # Clear memories older than 1 hour
+    CONTEXT_EXCHANGES = 5  # Exchanges a prompt context is trimmed back to
+    MAX_CONTEXT_EXCHANGES = 10  # Exchanges a prompt context grows to before trimming
+    MAX_CONVERSATIONS = 256  # Contexts kept before the least recently used is dropped
+
+    # Readers never take the lock: writers publish new immutable snapshots
+    # (tuples and strings) under it, and a reference read is atomic, so a
+    # reader sees either the old or the new state, never a partial update.
 
     def __init__(self):
-        self.lock = Lock()
-        self.conversation_history: List[Dict[str, str]] = []
-        self.important_memories: Dict[str, Dict[str, Any]] = {
-            f"memory{i}": {"value": None, "timestamp": None} 
-            for i in range(1, 4)
-        }
+        self.lock = Lock()  # Serializes writers only
+        # Bounded deque evicts the oldest entry in O(1) on append
+        self.conversation_history: Deque[Dict[str, str]] = deque(maxlen=self.MAX_HISTORY_SIZE)
+        # Per conversation: completed exchanges preformatted once, and their join.
+        # A context only grows by appending until it is trimmed, every
+        # MAX_CONTEXT_EXCHANGES - CONTEXT_EXCHANGES turns, so between trims each
+        # prompt extends the previous one and a prefix-caching backend only
+        # prefills the new turn.
+        self._contexts: "OrderedDict[str, Tuple[Tuple[str, ...], str]]" = OrderedDict()
+        # (key, value, timestamp) per slot, replaced wholesale on every write
+        self.important_memories: Tuple[Tuple[str, Optional[str], Optional[float]], ...] = tuple(
+            (f"memory{i}", None, None) for i in range(1, 4)
+        )
+        # (expiry time, key) min-heap, so expiry only touches memories that are due
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._next_expiry = float("inf")  # Earliest expiry, read without the lock
 
     def add_to_history(self, entry: Dict[str, str]) -> None:
         """Add entry to conversation history with size limit."""
         with self.lock:
-            if len(self.conversation_history) >= self.MAX_HISTORY_SIZE:
-                self.conversation_history.pop(0)
             self.conversation_history.append(entry)
 
+    def record_response(self, conversation_id: str, entry: Dict[str, str], response: str) -> None:
+        """Attach the assistant response to a history entry and add it to its conversation's context."""
+        with self.lock:
+            entry["assistant"] = response
+            exchanges, context = self._contexts.get(conversation_id, ((), ""))
+            exchange = f"User: {entry['user']}\nAssistant: {response}"
+            if len(exchanges) < self.MAX_CONTEXT_EXCHANGES:
+                exchanges += (exchange,)
+                context = f"{context}\n{exchange}" if context else exchange
+            else:
+                # Trim in one step rather than one exchange per turn
+                exchanges = exchanges[-(self.CONTEXT_EXCHANGES - 1):] + (exchange,)
+                context = "\n".join(exchanges)
+            self._contexts[conversation_id] = (exchanges, context)
+            self._contexts.move_to_end(conversation_id)
+            if len(self._contexts) > self.MAX_CONVERSATIONS:
+                self._contexts.popitem(last=False)
+
+    def get_conversation_context(self, conversation_id: str) -> str:
+        """Get a conversation's completed exchanges formatted for the prompt."""
+        return self._contexts.get(conversation_id, ((), ""))[1]
+
     def store_memory(self, value: str) -> Optional[str]:
         """Store a memory in the first available slot."""
         current_time = time.time()
         with self.lock:
-            # Clear old memories
-            for key, data in self.important_memories.items():
-                if data["timestamp"] and current_time - data["timestamp"] > self.MAX_MEMORY_AGE:
-                    data["value"] = None
-                    data["timestamp"] = None
+            self._expire_memories(current_time)
 
             # Find first empty slot
-            for key, data in self.important_memories.items():
-                if data["value"] is None:
-                    data["value"] = value
-                    data["timestamp"] = current_time
+            for key, stored, _ in self.important_memories:
+                if stored is None:
+                    self._write_memory(key, value, current_time)
                     return key
         return None
 
+    def set_memory(self, key: str, value: str) -> bool:
+        """Overwrite a specific memory slot. Returns False for an unknown key."""
+        with self.lock:
+            if not any(slot == key for slot, _, _ in self.important_memories):
+                return False
+            self._write_memory(key, value, time.time())
+        return True
+
     def get_memories(self) -> List[str]:
         """Get all active memories."""
         current_time = time.time()
-        with self.lock:
-            return [
-                data["value"] for data in self.important_memories.values()
-                if data["value"] and data["timestamp"] 
-                and current_time - data["timestamp"] <= self.MAX_MEMORY_AGE
-            ]
-
-    def clear_history(self) -> None:
-        """Clear conversation history."""
+        if current_time >= self._next_expiry:
+            with self.lock:
+                self._expire_memories(current_time)
+        return [stored for _, stored, _ in self.important_memories if stored]
+
+    def _write_memory(self, key: str, value: str, current_time: float) -> None:
+        """Publish a new value for a slot and schedule its expiry. Caller holds the lock."""
+        self.important_memories = tuple(
+            (slot, value, current_time) if slot == key else (slot, stored, timestamp)
+            for slot, stored, timestamp in self.important_memories
+        )
+        heapq.heappush(self._expiry_heap, (current_time + self.MAX_MEMORY_AGE, key))
+        self._next_expiry = self._expiry_heap[0][0]
+
+    def _expire_memories(self, current_time: float) -> None:
+        """Clear memories past their age limit. Caller holds the lock."""
+        # Only entries actually due are popped. An entry whose slot has been
+        # rewritten since no longer matches the slot's timestamp and is skipped.
+        expired = set()
+        while self._expiry_heap and self._expiry_heap[0][0] <= current_time:
+            expired.add(heapq.heappop(self._expiry_heap))
+        if expired:
+            self.important_memories = tuple(
+                (slot, None, None)
+                if timestamp is not None and (timestamp + self.MAX_MEMORY_AGE, slot) in expired
+                else (slot, stored, timestamp)
+                for slot, stored, timestamp in self.important_memories
+            )
+        self._next_expiry = self._expiry_heap[0][0] if self._expiry_heap else float("inf")
+
+    def clear_history(self, conversation_id: str) -> None:
+        """Clear a conversation's prompt context, along with the shared history."""
         with self.lock:
             self.conversation_history.clear()
+            self._contexts.pop(conversation_id, None)
 
 # Initialize memory manager
 memory_manager = MemoryManager()
 
+@functools.cache
+def get_embedding_model() -> Any:
+    """Load the embedding model used to match similar prompts on first use."""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+
+def embed_text(text: str) -> np.ndarray:
+    """Embed text into an L2-normalized float32 vector."""
+    embedding = get_embedding_model().encode(text, convert_to_numpy=True, normalize_embeddings=True)
+    return embedding.astype(np.float32, copy=False)
+
+class SemanticCache:
+    MAX_ENTRIES = 4096  # Ring capacity; the oldest entry is overwritten when full
+    SIMILARITY_THRESHOLD = 0.90  # Minimum cosine similarity for a hit
+    CACHE_DIR = "cache"
+    CACHE_FILE = "semantic.bin"  # Header, float32 embedding matrix, then length-prefixed responses
+    HEADER = struct.Struct("<QQQ")  # Total inserts, embedding dimension, rows filled
+    FLUSH_INTERVAL = 32  # Inserts between snapshots written to disk
+
+    def __init__(self):
+        self.lock = Lock()
+        # One contiguous row per entry so a lookup is a single BLAS matrix-vector
+        # product. Rows are unit length, so the dot product is the cosine similarity.
+        # A restart maps the last snapshot copy-on-write: pages are loaded on demand
+        # and shared between worker processes until one of them overwrites a row,
+        # and nothing a process stores ever reaches another process's view.
+        # While running, the cache is per worker. Each worker's snapshot
+        # replaces the file, so the last one to flush is what a restart loads.
+        self._embeddings: Optional[np.ndarray] = None  # Created once the dimension is known
+        self._responses: List[Optional[str]] = [None] * self.MAX_ENTRIES
+        self._count = 0  # Total inserts; the next row written is _count % MAX_ENTRIES
+        self._opened = False
+        self._writer: Optional[Thread] = None  # Background snapshot write in progress
+        self._path = os.path.join(self.CACHE_DIR, self.CACHE_FILE)
+        atexit.register(self.flush)
+
+    def _open(self, dim: int) -> None:
+        """Map the last snapshot, if there is one written for this embedding dimension."""
+        self._opened = True
+        if not os.path.exists(self._path):
+            return
+        try:
+            with open(self._path, 'rb') as f:
+                count, stored_dim, filled = self.HEADER.unpack(f.read(self.HEADER.size))
+                if stored_dim != dim:
+                    logger.error(f"Discarding semantic cache built for {stored_dim}-dimensional embeddings")
+                    return
+                f.seek(self.MAX_ENTRIES * dim * 4, os.SEEK_CUR)
+                responses = []
+                for _ in range(filled):
+                    (length,) = struct.unpack("<I", f.read(4))
+                    responses.append(f.read(length).decode('utf-8'))
+            embeddings = np.memmap(
+                self._path, dtype=np.float32, mode='c',
+                offset=self.HEADER.size, shape=(self.MAX_ENTRIES, dim)
+            )
+        except (OSError, ValueError, struct.error) as e:
+            logger.error(f"Discarding unreadable semantic cache: {str(e)}")
+            return
+
+        self._embeddings = embeddings
+        self._responses[:filled] = responses
+        self._count = count
+
+    def _snapshot(self) -> Optional[Tuple[int, np.ndarray, List[str]]]:
+        """Copy the filled rows and their responses; the caller holds the lock."""
+        if self._embeddings is None:
+            return None
+        filled = min(self._count, self.MAX_ENTRIES)
+        return self._count, np.array(self._embeddings[:filled]), self._responses[:filled]
+
+    def _write(self, snapshot: Tuple[int, np.ndarray, List[str]]) -> None:
+        """Write a snapshot to disk, replacing the previous one atomically."""
+        count, rows, responses = snapshot
+        dim = rows.shape[1]
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            temp_path = f"{self._path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(self.HEADER.pack(count, dim, len(responses)))
+                rows.tofile(f)
+                # Unfilled rows are skipped rather than written; the matrix keeps
+                # its full size so the next start can map it in place
+                f.seek(self.HEADER.size + self.MAX_ENTRIES * dim * 4)
+                for response in responses:
+                    data = response.encode('utf-8')
+                    f.write(struct.pack("<I", len(data)))
+                    f.write(data)
+            os.replace(temp_path, self._path)
+        except OSError as e:
+            logger.error(f"Failed to persist semantic cache: {str(e)}")
+
+    def flush(self) -> None:
+        """Write a snapshot of this process's cache to disk and wait for it."""
+        with self.lock:
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+        with self.lock:
+            snapshot = self._snapshot()
+        if snapshot is not None:
+            self._write(snapshot)
+
+    def lookup(self, embedding: np.ndarray) -> Optional[str]:
+        """Return the cached response for the most similar prompt, if close enough."""
+        with self.lock:
+            if not self._opened:
+                self._open(embedding.shape[0])
+            if self._count == 0:
+                return None
+            filled = min(self._count, self.MAX_ENTRIES)
+            similarities = self._embeddings[:filled] @ embedding
+            best = int(similarities.argmax())
+            if similarities[best] < self.SIMILARITY_THRESHOLD:
+                return None
+            return self._responses[best]
+
+    def store(self, embedding: np.ndarray, response: str) -> None:
+        """Cache a response, overwriting the oldest entry when full."""
+        with self.lock:
+            if not self._opened:
+                self._open(embedding.shape[0])
+            if self._embeddings is None:
+                self._embeddings = np.zeros((self.MAX_ENTRIES, embedding.shape[0]), dtype=np.float32)
+            row = self._count % self.MAX_ENTRIES
+            self._embeddings[row] = embedding
+            self._responses[row] = response
+            self._count += 1
+            # Copy under the lock but write on a background thread, so lookups
+            # never wait on the disk. A flush due while one is running is skipped.
+            if self._count % self.FLUSH_INTERVAL == 0 and (self._writer is None or not self._writer.is_alive()):
+                self._writer = Thread(
+                    target=self._write, args=(self._snapshot(),),
+                    name="semantic-cache-flush", daemon=True
+                )
+                self._writer.start()
+
 # Initialize Groq client with retry mechanism
 class GroqClient:
     MAX_RETRIES = 3
-    RETRY_DELAY = 1
+    RETRY_INITIAL_WAIT = 0.2  # First backoff step in seconds, doubled per attempt with jitter
+    RETRY_MAX_WAIT = 4.0  # Cap on any single wait; a longer Retry-After fails instead
+    RETRYABLE_STATUS_CODES = {408, 429}  # Client errors worth retrying; other 4xx fail fast
+    EXACT_CACHE_SIZE = 512  # Identical prompts served without any lookup work
+    POOL_CONNECTIONS = 50  # Upper bound on concurrent connections to api.groq.com
+    POOL_KEEPALIVE = 10  # Idle connections kept open for reuse
+    CONNECT_TIMEOUT = 3.0
+    READ_TIMEOUT = 30.0
 
     def __init__(self):
+        from groq import Groq  # Deferred: the SDK and its pydantic models are slow to import
+
         groq_config = config.get('groq')
-        self.api_key = groq_config['api_key']
-        self.client = Groq(api_key=self.api_key)
-        self.lock = Lock()
+        self.api_key = groq_config.api_key
+        # Share one pooled keep-alive transport so each turn reuses an open
+        # TLS connection instead of handshaking with Groq again
+        self.http_client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=self.POOL_CONNECTIONS,
+                    max_keepalive_connections=self.POOL_KEEPALIVE
+                )
+            ),
+            timeout=httpx.Timeout(self.READ_TIMEOUT, connect=self.CONNECT_TIMEOUT)
+        )
+        # No client-wide lock: the httpx pool is thread-safe, so concurrent
+        # requests go out in parallel up to POOL_CONNECTIONS
+        # SDK- and transport-level retries are disabled so _create's policy,
+        # which also covers connection errors, is the only one
+        self.client = Groq(api_key=self.api_key, http_client=self.http_client, max_retries=0)
+        self.semantic_cache = SemanticCache()
+        # Exact-match LRU keyed by the BLAKE3 digest of the prompt
+        self._exact_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._exact_lock = Lock()
         
-    def create_chat_completion(self, messages: List[Dict[str, str]]) -> str:
-        """Create chat completion with retry logic."""
-        with self.lock:
-            for attempt in range(self.MAX_RETRIES):
-                try:
-                    response = self.client.chat.completions.create(
+    def create_chat_completion(self, user_content: str, question: Optional[str] = None) -> str:
+        """Create chat completion, serving repeated prompts from the caches.
+        
+        question is the bare user question to match against the semantic cache;
+        pass None when user_content carries memories or history, so answers
+        given in one context aren't reused in another.
+        """
+        prompt_key = self._prompt_key(user_content)
+        cached = self._exact_lookup(prompt_key)
+        if cached is not None:
+            return cached
+
+        # Serve near-duplicate questions from the cache without calling Groq
+        response_text = None
+        if question:
+            query_embedding = embed_text(question)
+            response_text = self.semantic_cache.lookup(query_embedding)
+        if response_text is None:
+            response_text = self._request_completion(self._build_messages(user_content))
+            if question:
+                self.semantic_cache.store(query_embedding, response_text)
+        self._exact_store(prompt_key, response_text)
+        return response_text
+
+    def stream_chat_completion(self, user_content: str, question: Optional[str] = None) -> Iterator[str]:
+        """Yield the completion in pieces as Groq generates it; see create_chat_completion."""
+        prompt_key = self._prompt_key(user_content)
+        cached = self._exact_lookup(prompt_key)
+        if cached is not None:
+            yield cached
+            return
+
+        if question:
+            query_embedding = embed_text(question)
+            cached = self.semantic_cache.lookup(query_embedding)
+            if cached is not None:
+                yield cached
+                return
+
+        pieces = []
+        for piece in self._request_stream(self._build_messages(user_content)):
+            pieces.append(piece)
+            yield piece
+        response_text = "".join(pieces)
+        if question:
+            self.semantic_cache.store(query_embedding, response_text)
+        self._exact_store(prompt_key, response_text)
+
+    @staticmethod
+    def _prompt_key(user_content: str) -> bytes:
+        """Fingerprint a prompt with SIMD-accelerated BLAKE3."""
+        return blake3.blake3(user_content.encode('utf-8')).digest()
+
+    def _exact_lookup(self, prompt_key: bytes) -> Optional[str]:
+        """Get the response cached for an identical prompt."""
+        with self._exact_lock:
+            response_text = self._exact_cache.get(prompt_key)
+            if response_text is not None:
+                self._exact_cache.move_to_end(prompt_key)
+            return response_text
+
+    def _exact_store(self, prompt_key: bytes, response_text: str) -> None:
+        """Cache a response for identical prompts, evicting the least recently used."""
+        with self._exact_lock:
+            self._exact_cache[prompt_key] = response_text
+            self._exact_cache.move_to_end(prompt_key)
+            if len(self._exact_cache) > self.EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+
+    @staticmethod
+    def _build_messages(user_content: str) -> List[Dict[str, str]]:
+        """Prefix the user message with the shared system message."""
+        return [SYSTEM_MSG, {"role": "user", "content": user_content}]
+
+    def _request_completion(self, messages: List[Dict[str, str]]) -> str:
+        """Call the Groq API and return the full response text."""
+        response = self._create(messages)
+        return response.choices[0].message.content
+
+    def _request_stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Call the Groq API and yield content deltas as they arrive."""
+        for chunk in self._create(messages, stream=True):
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+
+    def _create(self, messages: List[Dict[str, str]], stream: bool = False) -> Any:
+        """Create a Groq chat completion, retrying transient failures."""
+        try:
+            for attempt in Retrying(
+                stop=stop_after_attempt(self.MAX_RETRIES) | self._retry_after_too_long,
+                wait=self._retry_wait,
+                retry=retry_if_exception(self._is_retryable),
+                reraise=True
+            ):
+                with attempt:
+                    return self.client.chat.completions.create(
                         model="compound-beta",
-                        messages=messages
+                        messages=messages,
+                        stream=stream
                     )
-                    return response.choices[0].message.content
-                except Exception as e:
-                    if attempt == self.MAX_RETRIES - 1:
-                        logger.error(f"Failed to get Groq response after {self.MAX_RETRIES} attempts: {str(e)}")
-                        raise
-                    time.sleep(self.RETRY_DELAY)
+        except Exception as e:
+            logger.error(f"Failed to get Groq response: {str(e)}")
+            raise
+
+    def _is_retryable(self, error: BaseException) -> bool:
+        """Retry connection failures, timeouts, throttling and server errors."""
+        from groq import APIConnectionError, APIStatusError
+
+        if isinstance(error, APIConnectionError):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code in self.RETRYABLE_STATUS_CODES or error.status_code >= 500
+        return False
+
+    @staticmethod
+    def _retry_after(retry_state: RetryCallState) -> Optional[float]:
+        """Seconds the server asked us to wait via Retry-After, if it did."""
+        response = getattr(retry_state.outcome.exception(), "response", None)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass  # HTTP-date form; fall back to backoff
+        return None
+
+    def _retry_after_too_long(self, retry_state: RetryCallState) -> bool:
+        """Give up when the server asks for a longer wait than we allow.
+        
+        Retrying sooner than asked would only be throttled again.
+        """
+        retry_after = self._retry_after(retry_state)
+        return retry_after is not None and retry_after > self.RETRY_MAX_WAIT
 
-# Initialize Groq client
-groq_client = GroqClient()
+    def _retry_wait(self, retry_state: RetryCallState) -> float:
+        """Wait as long as the server asks via Retry-After, else back off with jitter."""
+        retry_after = self._retry_after(retry_state)
+        if retry_after is not None:
+            return retry_after  # At most RETRY_MAX_WAIT; longer requests stop retrying
+        backoff = self.RETRY_INITIAL_WAIT * 2 ** (retry_state.attempt_number - 1)
+        return min(backoff + random.uniform(0, self.RETRY_INITIAL_WAIT), self.RETRY_MAX_WAIT)
+
+@functools.cache
+def get_groq_client() -> GroqClient:
+    """Create the shared Groq client on first use."""
+    return GroqClient()
+
+def ask_groq(prompt: str) -> str:
+    """Get a response to a prompt; entry point for the voice assistant."""
+    # The voice path sends the bare transcribed question, so it is also the semantic key
+    return get_groq_client().create_chat_completion(prompt, question=prompt)
+
+def sse_event(data: str, event: Optional[str] = None) -> str:
+    """Format a server-sent event, splitting multi-line data per the SSE spec."""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+CONVERSATION_COOKIE = "cid"
+
+@app.before_request
+def load_conversation_id() -> None:
+    """Identify the browser's conversation from its cookie, or start a new one."""
+    g.conversation_id = request.cookies.get(CONVERSATION_COOKIE) or uuid.uuid4().hex
+
+@app.after_request
+def save_conversation_id(response: Response) -> Response:
+    """Give new conversations their id cookie."""
+    if request.cookies.get(CONVERSATION_COOKIE) != g.conversation_id:
+        response.set_cookie(CONVERSATION_COOKIE, g.conversation_id, httponly=True, samesite="Lax")
+    return response
 
 @app.route("/")
 def index() -> str:
@@ -129,8 +558,9 @@ def ask() -> tuple[Any, int]:
             return jsonify({"response": "I didn't hear anything."}), 400
 
         # Handle memory storage requests
-        if user_input.lower().startswith("remember: "):
-            memory_string = user_input[9:].strip('"')
+        # Lowercase only the prefix, not the whole input, to detect the command
+        if user_input[:REMEMBER_PREFIX_LEN].lower() == REMEMBER_PREFIX:
+            memory_string = user_input[REMEMBER_PREFIX_LEN:].strip('"')
             if memory_key := memory_manager.store_memory(memory_string):
                 return jsonify({"response": f"I'll remember that in {memory_key}."}), 200
             return jsonify({"response": "Sorry, my memory is full right now."}), 200
@@ -144,26 +574,36 @@ def ask() -> tuple[Any, int]:
             active_memories = memory_manager.get_memories()
             memories_context = "\n".join(f"Memory: {mem}" for mem in active_memories) if active_memories else ""
             
-            conversation_context = "\n".join(
-                f"User: {entry['user']}\nAssistant: {entry.get('assistant', '')}"
-                for entry in memory_manager.conversation_history[-5:]  # Only use last 5 exchanges for context
-            )
+            conversation_context = memory_manager.get_conversation_context(g.conversation_id)
             
-            prompt = f"{memories_context}\n{conversation_context}\nUser: {user_input}\nAssistant:"
+            # The conversation's context comes first because it only grows;
+            # memories change independently, so they follow it
+            prompt = f"{conversation_context}\n{memories_context}\nUser: {user_input}\nAssistant:"
+            # Match only the question semantically, and only when no memories or
+            # history could make the right answer differ from a cached one
+            question = None if memories_context or conversation_context else user_input
             
-            # Get response from Groq
-            messages = [
-                {
-                    "role": "system", 
-                    "content": "You are a helpful voice assistant named Jarvis. Your responses should NEVER include any references to previous conversations or questions, even if they are provided in the context. Focus solely on answering the current question directly."
-                },
-                {"role": "user", "content": prompt}
-            ]
+            # Get response from Groq, streaming tokens to clients that ask for server-sent events
+            if request.accept_mimetypes.best == "text/event-stream":
+                def generate() -> Iterator[str]:
+                    pieces = []
+                    try:
+                        for piece in get_groq_client().stream_chat_completion(prompt, question):
+                            pieces.append(piece)
+                            yield sse_event(piece)
+                    except Exception as e:
+                        logger.error(f"Error streaming AI response: {str(e)}")
+                        yield sse_event("Failed to get AI response", event="error")
+                        return
+                    memory_manager.record_response(g.conversation_id, conversation_entry, "".join(pieces))
+                    yield sse_event("", event="done")
+
+                return Response(stream_with_context(generate()), mimetype="text/event-stream"), 200
             
-            response_text = groq_client.create_chat_completion(messages)
+            response_text = get_groq_client().create_chat_completion(prompt, question)
             
             # Update conversation history with response
-            conversation_entry["assistant"] = response_text
+            memory_manager.record_response(g.conversation_id, conversation_entry, response_text)
             return jsonify({"response": response_text}), 200
             
         except Exception as e:
@@ -188,9 +628,7 @@ def set_memory() -> tuple[Any, int]:
         if not memory_key or not memory_value:
             return jsonify({"error": "Missing key or value"}), 400
             
-        if memory_key in memory_manager.important_memories:
-            memory_manager.important_memories[memory_key]["value"] = memory_value
-            memory_manager.important_memories[memory_key]["timestamp"] = time.time()
+        if memory_manager.set_memory(memory_key, memory_value):
             return jsonify({"response": f"Memory '{memory_key}' set."}), 200
             
         return jsonify({"response": "Invalid memory key."}), 400
@@ -203,7 +641,7 @@ def set_memory() -> tuple[Any, int]:
 def reset() -> tuple[Any, int]:
     """Reset conversation history."""
     try:
-        memory_manager.clear_history()
+        memory_manager.clear_history(g.conversation_id)
         return jsonify({"response": "Conversation history reset."}), 200
     except Exception as e:
         logger.error(f"Error resetting memory: {str(e)}")
@@ -216,14 +654,17 @@ def handle_error(error: Exception) -> tuple[Any, int]:
     return jsonify({"error": "Internal server error"}), 500
 
 if __name__ == "__main__":
+    configure_logging()
+    
     # Get web config
     web_config = config.get('web')
     
     # Run with error handling
     try:
         app.run(
-            host=web_config['host'],
-            port=web_config['port'],
+            host=web_config.host,
+            port=web_config.port,
+            threaded=True,  # Serve concurrent requests while others wait on Groq
             debug=False  # Disable debug mode in production
         )
     except Exception as e:
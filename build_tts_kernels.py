@@ -0,0 +1,32 @@
+"""
+Ahead-of-time compile the TTS sample conversion kernels.
+
+Writes the _tts_kernels extension next to src/speech/tts.py, which imports it
+in place of the numba JIT kernel so the first utterance doesn't pay the
+compile cost. Run with the project's Python after installing requirements:
+
+    python build_tts_kernels.py
+
+numba.pycc is deprecated and will be removed in a future numba release. If
+this script fails (or the module is gone), skip it: tts.py falls back to the
+cached JIT kernel, which only costs a compile on the very first run.
+"""
+from pathlib import Path
+
+import numpy as np
+from numba.pycc import CC
+
+cc = CC('_tts_kernels')
+cc.output_dir = str(Path(__file__).resolve().parent / "src" / "speech")
+
+_INT16_TO_F32 = np.float32(1.0 / 32768.0)  # Must match src/speech/tts.py
+
+@cc.export('i16_to_f32', 'void(i2[::1], f4[::1])')
+def i16_to_f32(src, dst):
+    """Scale 16-bit PCM to float32 in [-1, 1) in a single pass."""
+    for i in range(src.size):
+        dst[i] = src[i] * _INT16_TO_F32
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built {cc.name} in {cc.output_dir}")
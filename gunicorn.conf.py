@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for serving the web interface.
+Run with: gunicorn app:app
+"""
+
+from src.config import config
+
+web_config = config.get('web')
+
+bind = f"{web_config.host}:{web_config.port}"
+
+# Each /ask request spends nearly all of its time waiting on Groq, so threaded
+# workers let one process keep many LLM calls in flight instead of one per worker
+worker_class = "gthread"
+workers = 2
+threads = 16
+timeout = 60
+
+# Import the app once in the master; the Groq client and embedding model are
+# created lazily on first use, so forking workers stays cheap
+preload_app = True
+
+def on_starting(server):
+    """Set up the app's logging in the master before it imports the app."""
+    from app import configure_logging
+    configure_logging()
@@ -1,26 +1,40 @@
 import json
+import logging
 import os
 import signal
 import sys
 import time
 import threading
-from typing import Optional
+from typing import Callable, Optional
 from contextlib import ExitStack
 
+import numpy as np
+
+# Configured before anything below is imported, so TTS warnings and info reach the console
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
 from src.audio.recorder import AudioRecorder
 from src.audio.player import AudioPlayer
 from src.speech.keywords import KeywordDetector
 from src.speech.stt import SpeechToText
 from src.speech.tts import TextToSpeech
-from src.config import config
+
+# Resolved once here rather than on every command in the voice loop
+try:
+    from app import ask_groq as default_ask
+except ImportError:
+    default_ask = None
 
 class VoiceAssistant:
-    def __init__(self):
+    def __init__(self, ask_fn: Optional[Callable[[str], str]] = None):
         self.running = False
         self.exit_stack = ExitStack()
         self.lock = threading.Lock()
         self.error_count = 0
         self.MAX_ERRORS = 3
+        self.READ_TIMEOUT = 0.5  # Seconds to wait for an audio chunk
+        # Callable that answers a transcribed command; defaults to Groq
+        self.ask = ask_fn or default_ask
         
         # Initialize components using context managers
         self.recorder = self.exit_stack.enter_context(AudioRecorder())
@@ -72,14 +86,16 @@ class VoiceAssistant:
             print(f"User said: {text}")
 
             # Process the command using Groq integration
-            try:
-                from app import ask_groq
+            if self.ask is None:
+                self.speak("Groq integration is not available.")
+                return
                 
+            try:
                 # Add retry logic for API calls
                 max_retries = 3
                 for attempt in range(max_retries):
                     try:
-                        response = ask_groq(text)
+                        response = self.ask(text)
                         if response:
                             self.speak(response)
                             return
@@ -91,8 +107,6 @@ class VoiceAssistant:
                         
                 self.speak("I'm having trouble processing that request.")
                 
-            except ImportError:
-                self.speak("Groq integration is not available.")
             except Exception as e:
                 print(f"Error processing command: {str(e)}")
                 self.speak("I encountered an error while processing your request.")
@@ -118,9 +132,6 @@ class VoiceAssistant:
             self.speak("Voice assistant initialized. Listening for wake word.")
             
             # Main processing loop
-            audio_config = config.get('audio')
-            chunk_duration = audio_config['chunk_size'] / audio_config['sample_rate']
-            
             while self.running:
                 try:
                     # Reset error count periodically
@@ -130,9 +141,13 @@ class VoiceAssistant:
                             self._reinitialize_audio()
                             self.error_count = 0
                     
-                    # Get audio data
-                    audio_data = self.recorder.stop_recording()
+                    # Block until the recorder delivers the next chunk; the timeout
+                    # only bounds how long a shutdown request can go unnoticed
+                    audio_data = self.recorder.read_chunk(timeout=self.READ_TIMEOUT)
                     if audio_data is None:
+                        if self.running and not self.recorder.is_recording:
+                            # The recorder gave up after repeated input overflows
+                            self._reinitialize_audio()
                         continue
 
                     # Check for wake word
@@ -140,18 +155,13 @@ class VoiceAssistant:
                         self.speak("Yes, how can I help you?")
                         
                         # Record command with timeout
+                        self.recorder.stop_recording()
                         command_audio = self.recorder.record_fixed_duration()
                         if command_audio is not None:
                             self.process_command(command_audio)
                         
                         # Reset for next command
                         self._reinitialize_audio()
-                    else:
-                        # Continue listening
-                        self.recorder.start_recording()
-
-                    # Prevent CPU overuse
-                    time.sleep(chunk_duration / 2)
                     
                 except Exception as e:
                     print(f"Error in main loop: {str(e)}")
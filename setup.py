@@ -185,6 +185,23 @@ def setup():
     pip_command = "venv\\Scripts\\pip" if is_windows() else "venv/bin/pip"
     run_command(f"{pip_command} install -r requirements.txt")
     
+    # Precompile the TTS kernels; without them the first utterance JIT-compiles
+    print("Compiling TTS kernels...")
+    python_command = "venv\\Scripts\\python" if is_windows() else "venv/bin/python"
+    try:
+        run_command(f"{python_command} build_tts_kernels.py")
+    except subprocess.CalledProcessError:
+        # numba.pycc is deprecated and may be missing from newer numba releases
+        print("Could not precompile TTS kernels; they will be JIT-compiled on first use")
+    
+    # Build the optional Cython espeak-ng bindings; needs Cython and the
+    # espeak-ng development headers, otherwise TTS uses ctypes
+    print("Building Cython espeak-ng bindings...")
+    try:
+        run_command(f"{python_command} -m Cython.Build.Cythonize -i src/speech/_espeak_cy.pyx")
+    except subprocess.CalledProcessError:
+        print("Could not build the Cython bindings; TTS will call espeak-ng through ctypes")
+    
     # Download models
     download_models()
     
@@ -3,19 +3,21 @@ import numpy as np
 import threading
 from threading import Lock, Event
 from typing import Optional
-from ..config import config
+from ..config import AUDIO_CFG
 
 class AudioPlayer:
     def __init__(self):
-        # Get config from singleton
-        audio_config = config.get('audio')
-        self.sample_rate = audio_config['sample_rate']
-        self.channels = audio_config['channels']
+        # Config sections resolved once at import
+        audio_config = AUDIO_CFG
+        self.sample_rate = audio_config.sample_rate
+        self.channels = audio_config.channels
+        self.latency = audio_config.latency
         
         self.lock = Lock()
         self.is_playing = False
         self._play_thread: Optional[threading.Thread] = None
         self._stop_event = Event()
+        self.FINISH_GRACE = 1.0  # Seconds past the audio length before giving up
 
     def play(self, audio_data: np.ndarray, blocking: bool = False) -> bool:
         """
@@ -29,14 +31,19 @@ class AudioPlayer:
             bool: True if playback started successfully
         """
         try:
-            # Ensure correct data format
-            if audio_data.dtype != np.float32:
-                audio_data = audio_data.astype(np.float32)
+            # Ensure correct data format; a converted array is ours to modify
+            owned = audio_data.dtype != np.float32
+            if owned:
+                audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
 
-            # Normalize if needed
-            max_val = np.abs(audio_data).max()
+            # Normalize if needed, scaling by the reciprocal
+            max_val = float(np.abs(audio_data).max())
             if max_val > 1.0:
-                audio_data = audio_data / max_val
+                scale = np.float32(1.0 / max_val)
+                if owned:
+                    np.multiply(audio_data, scale, out=audio_data)
+                else:
+                    audio_data = audio_data * scale
 
             with self.lock:
                 if self.is_playing:
@@ -63,15 +70,35 @@ class AudioPlayer:
 
     def _play_blocking(self, audio_data: np.ndarray) -> bool:
         """Internal method to play audio in a blocking way."""
+        # Frames x channels; a mono column broadcasts across output channels
+        audio_data = audio_data.reshape(audio_data.shape[0], -1)
+        finished = Event()
+        position = 0
+
+        def callback(outdata, frames, time, status):
+            nonlocal position
+            if self._stop_event.is_set():
+                raise sd.CallbackAbort
+            chunk = audio_data[position:position + frames]
+            n = len(chunk)
+            outdata[:n] = chunk
+            if n < frames:
+                outdata[n:] = 0
+                raise sd.CallbackStop
+            position += n
+
         try:
             with sd.OutputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
-                dtype=np.float32
-            ) as stream:
-                stream.write(audio_data)
-                while stream.active and not self._stop_event.is_set():
-                    sd.sleep(100)  # Sleep to prevent busy waiting
+                dtype=np.float32,
+                latency=self.latency,
+                callback=callback,
+                finished_callback=finished.set
+            ):
+                # The stream signals when it drains or is aborted by stop(), so
+                # this is a single wakeup rather than a polling loop
+                finished.wait(timeout=len(audio_data) / self.sample_rate + self.FINISH_GRACE)
                 return True
         except Exception as e:
             print(f"Error during playback: {str(e)}")
@@ -1,90 +1,140 @@
 import sounddevice as sd
 import numpy as np
 from typing import Optional
-import queue
+import itertools
+import os
 import threading
 from threading import Lock
-import time
-from ..config import config
+from ..config import AUDIO_CFG
 
 class AudioRecorder:
     def __init__(self):
-        # Get config from singleton
-        audio_config = config.get('audio')
-        self.sample_rate = audio_config['sample_rate']
-        self.channels = audio_config['channels']
-        self.chunk_size = audio_config['chunk_size']
-        self.record_seconds = audio_config['record_seconds']
+        # Config sections resolved once at import
+        audio_config = AUDIO_CFG
+        self.sample_rate = audio_config.sample_rate
+        self.channels = audio_config.channels
+        self._inv_channels = np.float32(1.0 / self.channels)  # For downmixing
+        self.chunk_size = audio_config.chunk_size
+        self.record_seconds = audio_config.record_seconds
+        self.latency = audio_config.latency
         
-        # Thread-safe queue with size limit to prevent memory issues
-        self.audio_queue = queue.Queue(maxsize=100)  # Limit queue size
+        # Single-producer/single-consumer ring of preallocated chunks. The
+        # callback is the only writer of _write_idx and the consumer the only
+        # writer of _read_idx; each int store is atomic, so neither side locks.
+        # The Event only wakes a waiting consumer.
+        self.RING_SLOTS = 128  # Limit buffered audio; must be a power of two
+        self._ring_mask = self.RING_SLOTS - 1
+        self._slots = np.empty((self.RING_SLOTS, self.chunk_size, self.channels), dtype=np.float32)
+        # Flat per-slot views matching PortAudio's interleaved layout, so the
+        # callback copies raw samples without reshaping for any channel count
+        self._flat_slots = self._slots.reshape(self.RING_SLOTS, -1)
+        self._write_idx = 0
+        self._read_idx = 0
+        self._chunk_ready = threading.Event()
+        self._dropped_chunks = 0  # Chunks lost to a full ring; only the callback writes it
+        self._overflowed = False  # Set by the callback when it stops the stream itself
         self.is_recording = False
         self.lock = Lock()  # For thread-safe state management
-        self.stream: Optional[sd.InputStream] = None
-        self._overflow_count = 0
+        self.stream: Optional[sd.RawInputStream] = None
+        self._overflow_count = itertools.count(1)  # next() is atomic; no lock needed
         self.MAX_OVERFLOW_COUNT = 5
+        self.RT_PRIORITY = 20  # SCHED_FIFO priority for the PortAudio callback thread
+        self._prio_set = False
 
     def callback(self, indata, frames, time, status):
         """This is called (from a separate thread) for each audio block."""
         try:
+            if not self._prio_set:
+                self._prio_set = True
+                self._raise_thread_priority()
+                
             if status:
                 print(f'Audio callback status: {status}')
                 if status.input_overflow:
-                    with self.lock:
-                        self._overflow_count += 1
-                    if self._overflow_count >= self.MAX_OVERFLOW_COUNT:
+                    if next(self._overflow_count) >= self.MAX_OVERFLOW_COUNT:
+                        # Only end the stream here; the consumer stops recording
+                        # and drains the ring, keeping _read_idx single-writer
                         print("Too many input overflows, stopping recording")
-                        self.stop_recording()
-                        return
+                        self._overflowed = True
+                        self._chunk_ready.set()
+                        raise sd.CallbackStop
                 
-            # Normalize audio data
-            normalized_data = self.normalize_audio(indata.copy())
-            
-            try:
-                # Non-blocking put with timeout
-                self.audio_queue.put(normalized_data, timeout=0.1)
-            except queue.Full:
-                print("Audio buffer full, dropping oldest chunk")
-                try:
-                    self.audio_queue.get_nowait()  # Remove oldest chunk
-                    self.audio_queue.put(normalized_data)
-                except (queue.Empty, queue.Full):
-                    pass  # Skip this chunk if queue operations fail
+            # indata is PortAudio's raw buffer, reused after we return, so copy it
+            # into the next ring slot. Normalization happens on the consumer side.
+            write_idx = self._write_idx
+            if write_idx - self._read_idx >= self.RING_SLOTS:
+                self._dropped_chunks += 1  # Consumer is behind; drop this chunk
+                return
+            samples = np.frombuffer(indata, dtype=np.float32)
+            np.copyto(self._flat_slots[write_idx & self._ring_mask], samples)
+            self._write_idx = write_idx + 1  # Publish only once the slot is full
+            self._chunk_ready.set()
                     
+        except sd.CallbackStop:
+            raise
         except Exception as e:
             print(f"Error in audio callback: {str(e)}")
 
-    def normalize_audio(self, audio_data: np.ndarray) -> np.ndarray:
-        """Normalize audio data and ensure correct format."""
-        # Convert to mono if multi-channel
+    def _raise_thread_priority(self) -> None:
+        """Move the calling (callback) thread to real-time FIFO scheduling on Linux."""
+        if not hasattr(os, 'sched_setscheduler'):
+            return  # Not available on this platform
+        try:
+            # pid 0 is the calling thread
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.RT_PRIORITY))
+        except OSError as e:
+            # Needs CAP_SYS_NICE or an rtprio limit; keep the default policy
+            print(f"Could not set real-time priority for audio callback: {str(e)}")
+
+    def normalize_audio(self, audio_data: np.ndarray, in_place: bool = False) -> np.ndarray:
+        """
+        Normalize audio data and ensure correct format.
+        
+        Returns a new array unless in_place is set, so audio_data may be a
+        view of a buffer the caller does not own. With in_place, mono audio
+        is scaled in audio_data itself.
+        """
+        # Convert to mono if multi-channel: sum the channels, then scale by the
+        # precomputed reciprocal. The result is a fresh array we can modify.
         if len(audio_data.shape) > 1 and audio_data.shape[1] > 1:
-            audio_data = np.mean(audio_data, axis=1, keepdims=True)
+            audio_data = np.add.reduce(audio_data, axis=1, keepdims=True)
+            audio_data *= self._inv_channels
+            in_place = True
         
-        # Normalize amplitude
-        max_val = np.abs(audio_data).max()
+        # Normalize amplitude, scaling by the reciprocal
+        max_val = float(np.abs(audio_data).max())
+        if in_place:
+            if max_val > 0:
+                np.multiply(audio_data, np.float32(1.0 / max_val), out=audio_data)
+            return audio_data
         if max_val > 0:
-            audio_data = audio_data / max_val
+            return audio_data * np.float32(1.0 / max_val)
             
-        return audio_data
+        return audio_data.copy()
 
-    def start_recording(self):
+    def start_recording(self) -> bool:
         """Start recording audio in a non-blocking way."""
         with self.lock:
             if self.is_recording:
-                return  # Already recording
+                return True  # Already recording
                 
             self.is_recording = True
-            self._overflow_count = 0
+            self._overflow_count = itertools.count(1)
+            self._overflowed = False
+            self._dropped_chunks = 0
+            self._prio_set = False  # Each stream gets its own callback thread
             
             try:
-                self.stream = sd.InputStream(
+                self.stream = sd.RawInputStream(
                     samplerate=self.sample_rate,
                     channels=self.channels,
                     callback=self.callback,
-                    blocksize=self.chunk_size,
+                    blocksize=self.chunk_size,  # Fixed: ring slots and the recognizer expect it
+                    latency=self.latency,
                     dtype=np.float32
                 )
                 self.stream.start()
+                return True
             except Exception as e:
                 self.is_recording = False
                 raise Exception(f"Failed to start recording: {str(e)}")
@@ -104,26 +154,72 @@ class AudioRecorder:
                     self.stream = None
             except Exception as e:
                 print(f"Error stopping stream: {str(e)}")
+                
+            if self._dropped_chunks:
+                print(f"Dropped {self._dropped_chunks} audio chunks while the consumer fell behind")
 
-        # Collect all audio data from the queue with timeout
-        audio_data = []
-        timeout = time.time() + 1.0  # 1 second timeout
-        
-        while time.time() < timeout:
-            try:
-                chunk = self.audio_queue.get_nowait()
-                audio_data.append(chunk)
-            except queue.Empty:
-                break
-
-        if not audio_data:
+        # Collect everything recorded, then normalize the whole buffer once
+        read_idx, write_idx = self._read_idx, self._write_idx
+        if read_idx == write_idx:
             return None
 
+        # Copy straight into one preallocated buffer. The pending slots are
+        # contiguous in the ring except where they wrap, so this is at most
+        # two block copies.
         try:
-            return np.concatenate(audio_data, axis=0)
+            count = write_idx - read_idx
+            frames = self.chunk_size
+            audio_data = np.empty((count * frames, self.channels), dtype=np.float32)
+            start = read_idx & self._ring_mask
+            head = min(count, self.RING_SLOTS - start)
+            audio_data[:head * frames] = self._slots[start:start + head].reshape(-1, self.channels)
+            if head < count:
+                audio_data[head * frames:] = self._slots[:count - head].reshape(-1, self.channels)
         except Exception as e:
-            print(f"Error concatenating audio data: {str(e)}")
+            print(f"Error collecting audio data: {str(e)}")
             return None
+        finally:
+            self._discard_pending(write_idx)
+
+        return self.normalize_audio(audio_data, in_place=True)
+
+    @property
+    def dropped_chunks(self) -> int:
+        """Chunks dropped in the current or last recording because the ring was full."""
+        return self._dropped_chunks
+
+    def _discard_pending(self, write_idx: int):
+        """Release every ring slot before write_idx back to the producer."""
+        self._read_idx = write_idx
+        self._chunk_ready.clear()
+
+    def read_chunk(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Wait for the next recorded chunk.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            np.ndarray: The chunk, owned by the caller, or None if none arrived
+                before the timeout or recording stopped after too many overflows
+        """
+        read_idx = self._read_idx
+        while read_idx == self._write_idx:
+            if self._overflowed:
+                self.stop_recording()  # The callback ended the stream; drain here
+                return None
+            self._chunk_ready.clear()
+            # Recheck after clearing so a chunk published in between isn't missed
+            if read_idx != self._write_idx:
+                break
+            if not self._chunk_ready.wait(timeout):
+                return None
+
+        try:
+            return self.normalize_audio(self._slots[read_idx & self._ring_mask])
+        finally:
+            self._read_idx = read_idx + 1  # Slot may be overwritten from here on
 
     def record_fixed_duration(self) -> Optional[np.ndarray]:
         """Record audio for a fixed duration specified in config."""
@@ -151,11 +247,7 @@ class AudioRecorder:
     def cleanup(self):
         """Clean up resources."""
         self.stop_recording()
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
+        self._discard_pending(self._write_idx)
                 
     def __enter__(self):
         """Context manager entry."""
@@ -1,10 +1,59 @@
 import os
 import json
-from typing import Dict, Any
+from dataclasses import MISSING, dataclass, fields, replace
+from typing import Dict, Any, Optional, Union
+
+@dataclass(frozen=True)
+class AudioConfig:
+    sample_rate: int
+    channels: int
+    chunk_size: int
+    record_seconds: float
+    latency: Union[str, float] = 'low'  # 'low', 'high' or seconds
+
+@dataclass(frozen=True)
+class SpeechConfig:
+    wake_phrase: str
+    keyword_threshold: float
+
+@dataclass(frozen=True)
+class WhisperConfig:
+    model: str
+    language: str
+    compute_type: Optional[str] = None  # None: int8 on CPU, float16 on CUDA
+    beam_size: int = 1  # Greedy decoding suits short commands
+
+@dataclass(frozen=True)
+class TTSConfig:
+    voice: str
+    rate: int
+    volume: float
+    worker_core: Optional[int] = None  # CPU to pin the synthesis thread to
+
+@dataclass(frozen=True)
+class GroqConfig:
+    api_key: str
+
+@dataclass(frozen=True)
+class WebConfig:
+    host: str
+    port: int
+
+# Section name -> immutable type its fields are loaded into
+SECTION_TYPES = {
+    'audio': AudioConfig,
+    'speech': SpeechConfig,
+    'whisper': WhisperConfig,
+    'tts': TTSConfig,
+    'groq': GroqConfig,
+    'web': WebConfig
+}
 
 class ConfigManager:
     _instance = None
     _config = None
+    _sections = None
+    _loaded = False
 
     def __new__(cls):
         if cls._instance is None:
@@ -12,8 +61,10 @@ class ConfigManager:
         return cls._instance
 
     def __init__(self):
-        if self._config is None:
-            self.load_config()
+        # ConfigManager() returns the singleton; only the first call loads
+        if self._loaded:
+            return
+        self.load_config()
 
     def load_config(self, config_path: str = "config/config.json") -> None:
         """Load configuration from file with validation."""
@@ -24,6 +75,11 @@ class ConfigManager:
             with open(config_path, 'r') as f:
                 self._config = json.load(f)
             self._validate_config()
+            self._sections = {
+                name: self._build_section(section_type, self._config[name])
+                for name, section_type in SECTION_TYPES.items()
+            }
+            self._loaded = True
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in config file: {str(e)}")
         except Exception as e:
@@ -31,36 +87,49 @@ class ConfigManager:
 
     def _validate_config(self) -> None:
         """Validate required configuration fields."""
+        # Fields without a default are required
         required_sections = {
-            'audio': ['sample_rate', 'channels', 'chunk_size', 'record_seconds'],
-            'speech': ['wake_phrase', 'keyword_threshold'],
-            'whisper': ['model', 'language'],
-            'tts': ['voice', 'rate', 'volume'],
-            'groq': ['api_key'],
-            'web': ['host', 'port']
+            name: [f.name for f in fields(section_type) if f.default is MISSING]
+            for name, section_type in SECTION_TYPES.items()
         }
 
-        for section, fields in required_sections.items():
+        for section, required in required_sections.items():
             if section not in self._config:
                 raise ValueError(f"Missing required config section: {section}")
             
-            for field in fields:
+            for field in required:
                 if field not in self._config[section]:
                     raise ValueError(f"Missing required config field: {section}.{field}")
 
-    def get(self, section: str = None) -> Dict[str, Any]:
-        """Get configuration or specific section."""
+    @staticmethod
+    def _build_section(section_type: type, values: Dict[str, Any]) -> Any:
+        """Build a frozen section from its JSON values, ignoring unknown keys."""
+        names = {f.name for f in fields(section_type)}
+        return section_type(**{k: v for k, v in values.items() if k in names})
+
+    def get(self, section: str = None) -> Any:
+        """Get configuration or specific section as a frozen dataclass."""
         if section is None:
-            return self._config
-        if section not in self._config:
+            return self._sections
+        if section not in self._sections:
             raise KeyError(f"Config section not found: {section}")
-        return self._config[section]
+        return self._sections[section]
 
     def update(self, section: str, key: str, value: Any) -> None:
         """Update a configuration value."""
-        if section not in self._config:
+        if section not in self._sections:
             raise KeyError(f"Config section not found: {section}")
+        current = self._sections[section]
+        if key not in {f.name for f in fields(current)}:
+            raise KeyError(f"Config field not found: {section}.{key}")
+        self._sections[section] = replace(current, **{key: value})
         self._config[section][key] = value
 
 # Global config instance
 config = ConfigManager()
+
+# Sections resolved once at import for hot constructors. These are snapshots:
+# config.update() replaces the section seen by config.get(), not these.
+AUDIO_CFG: AudioConfig = config.get('audio')
+SPEECH_CFG: SpeechConfig = config.get('speech')
+WHISPER_CFG: WhisperConfig = config.get('whisper')
@@ -0,0 +1,160 @@
+# cython: language_level=3
+# distutils: libraries = espeak-ng
+"""
+Optional Cython bindings for the espeak-ng calls on TextToSpeech's hot path.
+
+Build in place (needs Cython and the espeak-ng development headers):
+
+    cythonize -i src/speech/_espeak_cy.pyx
+
+TextToSpeech falls back to ctypes when this module isn't built. The PCM
+buffer is module-level state, so callers must serialize synth() calls;
+TextToSpeech does this with its lock.
+"""
+from libc.stdlib cimport realloc
+from libc.string cimport memcpy
+
+cdef extern from "Python.h":
+    const char *PyUnicode_AsUTF8AndSize(object unicode, Py_ssize_t *size) except NULL
+
+cdef extern from "espeak-ng/speak_lib.h":
+    ctypedef struct espeak_EVENT:
+        int type
+        int audio_position
+
+    int espeak_Initialize(int output, int buflength, const char *path, int options)
+    void espeak_SetSynthCallback(int (*SynthCallback)(short *, int, espeak_EVENT *))
+    int espeak_Synth(const void *text, size_t size, unsigned int position,
+                     int position_type, unsigned int end_position, unsigned int flags,
+                     unsigned int *unique_identifier, void *user_data) nogil
+    int espeak_SetParameter(int parameter, int value, int relative)
+
+cdef enum:
+    AUDIO_OUTPUT_SYNCHRONOUS = 2  # espeak_Synth returns once every chunk was delivered
+    POS_CHARACTER = 1
+    EE_OK = 0
+    EVENT_LIST_TERMINATED = 0
+    EVENT_MARK = 3
+
+# Synthesized samples, grown by doubling and reused across calls
+cdef short *_buf = NULL
+cdef size_t _capacity = 0
+cdef size_t _length = 0
+
+# Audio positions (ms) of <mark> events from the last synthesis
+cdef int *_marks = NULL
+cdef size_t _marks_capacity = 0
+cdef size_t _marks_length = 0
+
+
+cdef int _record_marks(espeak_EVENT *events) noexcept nogil:
+    """Append the positions of any mark events; returns 1 if out of memory."""
+    global _marks, _marks_capacity, _marks_length
+    cdef size_t new_capacity
+    cdef int *grown
+
+    while events.type != EVENT_LIST_TERMINATED:
+        if events.type == EVENT_MARK:
+            if _marks_length == _marks_capacity:
+                new_capacity = _marks_capacity * 2 if _marks_capacity else 16
+                grown = <int *>realloc(_marks, new_capacity * sizeof(int))
+                if grown == NULL:
+                    return 1
+                _marks = grown
+                _marks_capacity = new_capacity
+            _marks[_marks_length] = events.audio_position
+            _marks_length += 1
+        events += 1
+    return 0
+
+
+cdef int _synth_callback(short *wav, int numsamples, espeak_EVENT *events) noexcept nogil:
+    """Append a chunk of PCM to the buffer; returning 1 aborts synthesis."""
+    global _buf, _capacity, _length
+    cdef size_t needed
+    cdef size_t new_capacity
+    cdef short *grown
+
+    if events != NULL and _record_marks(events):
+        return 1
+
+    if wav == NULL or numsamples <= 0:
+        return 0
+
+    needed = _length + <size_t>numsamples
+    if needed > _capacity:
+        new_capacity = _capacity * 2 if _capacity else 4096
+        while new_capacity < needed:
+            new_capacity *= 2
+        grown = <short *>realloc(_buf, new_capacity * sizeof(short))
+        if grown == NULL:
+            return 1
+        _buf = grown
+        _capacity = new_capacity
+
+    memcpy(_buf + _length, wav, <size_t>numsamples * sizeof(short))
+    _length = needed
+    return 0
+
+
+def initialize(bytes path=None, int options=0):
+    """
+    Initialize espeak-ng in synchronous mode and register the PCM callback.
+
+    Returns:
+        int: The output sample rate in Hz, or a negative value on failure
+    """
+    cdef const char *c_path = NULL
+    if path is not None:
+        c_path = path
+    cdef int rate = espeak_Initialize(AUDIO_OUTPUT_SYNCHRONOUS, 0, c_path, options)
+    if rate > 0:
+        espeak_SetSynthCallback(_synth_callback)
+    return rate
+
+
+def synth(text, unsigned int flags=0):
+    """
+    Synthesize text; flags are espeak_Synth's (e.g. espeakSSML).
+
+    A str is passed as its cached UTF-8 form, so no bytes object is created;
+    UTF-8 encoded bytes are accepted as well.
+
+    Returns:
+        memoryview: int16 samples viewing the internal buffer, valid until the
+            next synth() call, or None if synthesis failed
+    """
+    global _length, _marks_length
+    cdef const char *c_text
+    cdef Py_ssize_t length
+    cdef int result
+    cdef bytes data
+
+    if isinstance(text, str):
+        # Points into text's own UTF-8 cache, kept alive by this frame
+        c_text = PyUnicode_AsUTF8AndSize(text, &length)
+    else:
+        data = text  # Typed local keeps the bytes alive while c_text points into it
+        c_text = data
+        length = len(data)
+    cdef size_t size = <size_t>length + 1  # Includes the terminating NUL
+
+    _length = 0
+    _marks_length = 0
+    with nogil:
+        result = espeak_Synth(c_text, size, 0, POS_CHARACTER, 0, flags, NULL, NULL)
+    if result != EE_OK:
+        return None
+    if _length == 0:
+        return memoryview(b'').cast('h')
+    return <short[:_length]> _buf
+
+
+def marks():
+    """Audio positions in milliseconds of the <mark> events from the last synth()."""
+    return [_marks[i] for i in range(_marks_length)]
+
+
+def set_param(int parameter, int value, int relative=0):
+    """Set an espeak_PARAMETER; returns espeak's status code."""
+    return espeak_SetParameter(parameter, value, relative)
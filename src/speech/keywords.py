@@ -1,10 +1,24 @@
+import vosk
 from vosk import Model, KaldiRecognizer
-import json
+import orjson
 import numpy as np
+from numba import njit
 import os
 from typing import Optional, Callable
-from threading import Lock
-from ..config import config
+import threading
+from threading import Lock, Event
+from ..config import AUDIO_CFG, SPEECH_CFG
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def f32_to_i16(src, dst):
+    """Scale float audio in [-1, 1] to 16-bit PCM in dst, clamping in one pass."""
+    for i in range(src.size):
+        v = src[i] * 32767.0
+        if v > 32767.0:
+            v = 32767.0
+        elif v < -32768.0:
+            v = -32768.0
+        dst[i] = np.int16(v)
 
 class KeywordDetector:
     def __init__(self, model_path: str = "models/vosk-model"):
@@ -14,13 +28,33 @@ class KeywordDetector:
         Args:
             model_path: Path to the Vosk model directory
         """
-        # Get config from singleton
-        speech_config = config.get('speech')
-        audio_config = config.get('audio')
+        # Config sections resolved once at import
+        speech_config = SPEECH_CFG
+        audio_config = AUDIO_CFG
+        
+        self.wake_phrase = speech_config.wake_phrase.lower()
+        self._wake_words = frozenset(self.wake_phrase.split())  # For _calculate_confidence
+        self.threshold = speech_config.keyword_threshold
+        self.sample_rate = audio_config.sample_rate
         
-        self.wake_phrase = speech_config['wake_phrase'].lower()
-        self.threshold = speech_config['keyword_threshold']
-        self.sample_rate = audio_config['sample_rate']
+        # Single-producer/single-consumer ring of int16 frames. process_audio
+        # converts into the next slot on the caller's thread; the recognizer
+        # thread runs Vosk on published slots. Only the producer advances
+        # _write_idx and only the recognizer (under self.lock) _read_idx.
+        self.RING_SLOTS = 64  # Must be a power of two
+        self._ring_mask = self.RING_SLOTS - 1
+        self._frame_size = audio_config.chunk_size
+        self._frames = np.empty((self.RING_SLOTS, self._frame_size), dtype=np.int16)
+        self._frame_lens = [0] * self.RING_SLOTS
+        self._write_idx = 0
+        self._read_idx = 0
+        self._frames_ready = Event()
+        self._detected = Event()
+        self._dropped_frames = 0
+        # AcceptWaveform's cffi call takes bytes only, so frames go to the C
+        # function directly as a cffi view of the ring. Cleared if this Vosk
+        # build lacks those internals.
+        self._zero_copy_waveform = hasattr(vosk, '_ffi') and hasattr(vosk, '_c')
         
         # Validate and initialize model
         self._validate_model_path(model_path)
@@ -30,6 +64,7 @@ class KeywordDetector:
         self.is_listening = False
         self._last_detected = None
         self._callback: Optional[Callable[[str], None]] = None
+        self._reco_thread: Optional[threading.Thread] = None
         
     def _validate_model_path(self, model_path: str) -> None:
         """Validate the Vosk model path and files."""
@@ -59,57 +94,138 @@ class KeywordDetector:
 
     def process_audio(self, audio_data: np.ndarray) -> bool:
         """
-        Process audio data and check for wake word.
+        Queue audio data for the recognizer thread and check for wake word.
+        
+        Recognition runs asynchronously, so a detection is reported by the
+        first call after the recognizer has seen the wake phrase.
         
         Args:
             audio_data: Audio data as numpy array
             
         Returns:
-            bool: True if wake word was detected
+            bool: True if wake word was detected since the last call
         """
         if not self.is_listening:
             return False
             
         try:
-            # Ensure audio data is in the correct format (16-bit integers)
-            if audio_data.dtype != np.float32:
-                audio_data = audio_data.astype(np.float32)
-                
-            audio_int16 = (audio_data * 32768).astype(np.int16).tobytes()
-            
-            if self.recognizer.AcceptWaveform(audio_int16):
-                result = json.loads(self.recognizer.Result())
-                if 'text' in result and result['text']:
-                    detected_text = result['text'].lower()
-                    confidence = self._calculate_confidence(detected_text)
-                    
-                    if self.wake_phrase in detected_text and confidence >= self.threshold:
-                        with self.lock:
-                            self._last_detected = detected_text
-                            if self._callback:
-                                try:
-                                    self._callback(detected_text)
-                                except Exception as e:
-                                    print(f"Error in wake word callback: {str(e)}")
-                        return True
+            samples = audio_data.reshape(-1)
+            for start in range(0, samples.size, self._frame_size):
+                self._enqueue(samples[start:start + self._frame_size])
             
+            if self._detected.is_set():
+                self._detected.clear()
+                return True
             return False
             
         except Exception as e:
             print(f"Error processing audio: {str(e)}")
             return False
             
+    def _enqueue(self, samples: np.ndarray) -> None:
+        """Convert one frame to int16 straight into the next ring slot."""
+        write_idx = self._write_idx
+        if write_idx - self._read_idx >= self.RING_SLOTS:
+            self._dropped_frames += 1  # Recognizer is behind; drop this frame
+            return
+            
+        slot = write_idx & self._ring_mask
+        n = samples.size
+        self._to_int16(samples, self._frames[slot, :n])
+        self._frame_lens[slot] = n
+        self._write_idx = write_idx + 1  # Publish only once the slot is full
+        self._frames_ready.set()
+        
+    def _to_int16(self, samples: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Convert float audio in [-1, 1] to 16-bit PCM in out."""
+        f32_to_i16(samples, out)
+        return out
+
+    def _next_frame(self) -> bool:
+        """Wait for a frame; False once listening has stopped."""
+        while self.is_listening:
+            if self._read_idx != self._write_idx:
+                return True
+            self._frames_ready.clear()
+            # Recheck after clearing so a frame published in between isn't missed
+            if self._read_idx != self._write_idx:
+                return True
+            self._frames_ready.wait()
+        return False
+
+    def _reco_loop(self) -> None:
+        """Run the recognizer over queued frames until listening stops."""
+        while self._next_frame():
+            try:
+                with self.lock:
+                    read_idx = self._read_idx
+                    if read_idx == self._write_idx:
+                        continue  # Discarded by reset()
+                    slot = read_idx & self._ring_mask
+                    frame = self._frames[slot, :self._frame_lens[slot]]
+                    result = None
+                    if self._accept_waveform(frame):
+                        result = self.recognizer.Result()
+                    self._read_idx = read_idx + 1
+                    
+                if result is not None:
+                    self._handle_result(result)
+                    
+            except Exception as e:
+                print(f"Error in wake word recognizer: {str(e)}")
+                
+    def _accept_waveform(self, frame: np.ndarray) -> bool:
+        """Feed a frame to Vosk, without copying it when the binding allows."""
+        if self._zero_copy_waveform:
+            try:
+                # Same call AcceptWaveform makes, but on a view of the frame
+                result = vosk._c.vosk_recognizer_accept_waveform(
+                    self.recognizer._handle, vosk._ffi.from_buffer(frame), frame.nbytes
+                )
+            except (AttributeError, TypeError):
+                # Internals differ in this build; stop trying for the session
+                self._zero_copy_waveform = False
+            else:
+                if result < 0:
+                    raise Exception("Failed to process waveform")
+                return bool(result)
+        return self.recognizer.AcceptWaveform(frame.tobytes())
+
+    def _handle_result(self, raw_result: str) -> None:
+        """Check a final recognizer result for the wake phrase."""
+        # Vosk emits lowercase text, so a result whose raw JSON lacks the wake
+        # phrase can't match; skip parsing it
+        if self.wake_phrase not in raw_result:
+            return
+            
+        result = orjson.loads(raw_result)
+        if 'text' in result and result['text']:
+            detected_text = result['text'].lower()
+            
+            # Cheap substring test first; only score text that passes it
+            if (self.wake_phrase in detected_text
+                    and self._calculate_confidence(detected_text) >= self.threshold):
+                # Single reference stores/loads are atomic, so no lock is needed
+                # here; the lock only guards listening state transitions
+                self._last_detected = detected_text
+                callback = self._callback
+                if callback:
+                    try:
+                        callback(detected_text)
+                    except Exception as e:
+                        print(f"Error in wake word callback: {str(e)}")
+                self._detected.set()
+
     def _calculate_confidence(self, text: str) -> float:
         """Calculate confidence score for wake word detection."""
         # Simple confidence calculation based on word count
         # Could be improved with more sophisticated metrics
         words = text.split()
-        if not words:
+        if not words or not self._wake_words:
             return 0.0
             
-        wake_words = self.wake_phrase.split()
-        matches = sum(1 for w in wake_words if w in words)
-        return matches / len(wake_words)
+        matches = len(self._wake_words.intersection(words))
+        return matches / len(self._wake_words)
 
     def start_listening(self, callback: Optional[Callable[[str], None]] = None) -> bool:
         """
@@ -130,6 +246,15 @@ class KeywordDetector:
                 self._last_detected = None
                 self._callback = callback
                 self.recognizer.Reset()  # Reset the recognizer state
+                self._read_idx = self._write_idx
+                self._detected.clear()
+                
+                self._reco_thread = threading.Thread(
+                    target=self._reco_loop,
+                    name="wake-word-recognizer",
+                    daemon=True
+                )
+                self._reco_thread.start()
                 return True
                 
         except Exception as e:
@@ -143,17 +268,23 @@ class KeywordDetector:
             self.is_listening = False
             self._last_detected = None
             self._callback = None
+            reco_thread, self._reco_thread = self._reco_thread, None
+        
+        self._frames_ready.set()  # Wake the recognizer so it sees the flag
+        if reco_thread is not None and reco_thread is not threading.current_thread():
+            reco_thread.join(timeout=1.0)
 
     def get_last_detected(self) -> Optional[str]:
         """Get the last detected phrase that contained the wake word."""
-        with self.lock:
-            return self._last_detected
+        return self._last_detected
 
     def reset(self) -> None:
         """Reset the detector state."""
         with self.lock:
             self.recognizer.Reset()
             self._last_detected = None
+            self._read_idx = self._write_idx  # Drop frames queued before the reset
+            self._detected.clear()
             
     def cleanup(self) -> None:
         """Clean up resources."""
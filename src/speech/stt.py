@@ -1,20 +1,24 @@
 from faster_whisper import WhisperModel
+import ctranslate2
 import numpy as np
 from typing import Optional
 import os
 from threading import Lock
-from ..config import config
+from ..config import WHISPER_CFG
 
 class SpeechToText:
     def __init__(self):
         """Initialize speech-to-text with faster-whisper."""
-        # Get config from singleton
-        whisper_config = config.get('whisper')
-        self.model_name = whisper_config['model']
-        self.language = whisper_config['language']
+        # Config sections resolved once at import
+        whisper_config = WHISPER_CFG
+        self.model_name = whisper_config.model
+        self.language = whisper_config.language
+        self.compute_type = whisper_config.compute_type
+        self.beam_size = whisper_config.beam_size
         
         self.lock = Lock()
         self.model = None
+        self._scratch = np.empty(0, dtype=np.float32)  # Grown to the longest input
         
         # Initialize model
         self._init_model()
@@ -25,14 +29,18 @@ class SpeechToText:
             model_dir = os.path.join("models", "whisper")
             os.makedirs(model_dir, exist_ok=True)
             
-            # Initialize model with compute type optimized for the device
+            # Quantized weights unless the config overrides it: "auto" picks
+            # float32 on most CPUs, which is the slowest option
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            compute_type = self.compute_type or ("float16" if device == "cuda" else "int8")
+            
             self.model = WhisperModel(
                 self.model_name,
-                device="auto",  # Will use CUDA if available, else CPU
-                compute_type="auto",  # Will select optimal compute type
+                device=device,
+                compute_type=compute_type,
                 download_root=model_dir
             )
-            print(f"Initialized Whisper model: {self.model_name}")
+            print(f"Initialized Whisper model: {self.model_name} ({device}, {compute_type})")
         except Exception as e:
             raise Exception(f"Failed to initialize Whisper model: {str(e)}")
 
@@ -52,20 +60,30 @@ class SpeechToText:
             
         try:
             with self.lock:
-                # Ensure audio data is in the correct format (32-bit float)
-                if audio_data.dtype != np.float32:
-                    audio_data = audio_data.astype(np.float32)
+                # Whisper expects a flat mono float32 signal. Copy into the
+                # reused scratch buffer (casting as needed), which is then ours
+                # to normalize in place; it is only touched under self.lock.
+                samples = audio_data.reshape(-1)
+                n = samples.size
+                if n == 0:
+                    return None
+                if self._scratch.size < n:
+                    self._scratch = np.empty(n, dtype=np.float32)
+                buf = self._scratch[:n]
+                np.copyto(buf, samples)
                 
-                # Normalize audio if needed
-                max_val = np.abs(audio_data).max()
+                # Normalize audio if needed, scaling by the reciprocal
+                max_val = float(np.abs(buf).max())
                 if max_val > 1.0:
-                    audio_data = audio_data / max_val
+                    buf *= np.float32(1.0 / max_val)
                 
                 # Perform transcription
                 segments, _ = self.model.transcribe(
-                    audio_data,
+                    buf,
                     language=self.language,
-                    beam_size=5,
+                    beam_size=self.beam_size,
+                    temperature=0.0,  # Deterministic, no fallback re-decodes
+                    condition_on_previous_text=False,  # Commands are independent
                     vad_filter=True,  # Filter out non-speech
                     vad_parameters=dict(
                         min_silence_duration_ms=500,
@@ -77,14 +95,19 @@ class SpeechToText:
                 text = " ".join(segment.text for segment in segments).strip()
                 return text if text else None
                 
-        except Exception as e:
+        except RuntimeError as e:
+            # CTranslate2 reports backend failures as RuntimeError; only those
+            # justify reloading the model from disk
             print(f"Transcription error: {str(e)}")
-            # Attempt to reinitialize model on failure
             try:
                 self._init_model()
             except Exception as e2:
                 print(f"Failed to reinitialize model: {str(e2)}")
             return None
+        except Exception as e:
+            # Bad input (shape, dtype, ...) leaves the model usable
+            print(f"Transcription error: {str(e)}")
+            return None
 
     def update_language(self, language: str) -> None:
         """Update the transcription language."""
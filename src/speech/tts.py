@@ -1,27 +1,44 @@
 import ctypes
+import logging
 import os
 import platform
 import numpy as np
 import sounddevice as sd
-from typing import Optional, Dict
+from numba import njit, prange
+from typing import Optional, Dict, List
+from xml.sax.saxutils import escape
 from pathlib import Path
-from threading import Lock
-import tempfile
+import queue
+import threading
+from threading import Lock, Event
 import soundfile as sf
 from ctypes import (
-    CDLL, c_int, c_char_p, c_wchar_p, 
-    c_void_p, c_float, POINTER, Structure
+    CDLL, CFUNCTYPE, c_int, c_uint, c_short, c_char, c_char_p, c_wchar_p, 
+    c_void_p, c_float, POINTER, Structure, Union
 )
 from ..config import config
 
-# Define espeak structures
-class SpeakAudioStruct(Structure):
-    _fields_ = [
-        ("data", POINTER(c_int)),
-        ("length", c_int),
-        ("sampling_rate", c_int),
-    ]
+logger = logging.getLogger(__name__)
+
+try:
+    from . import _espeak_cy  # Optional Cython bindings, see _espeak_cy.pyx
+except ImportError:
+    _espeak_cy = None
+
+_INT16_TO_F32 = np.float32(1.0 / 32768.0)  # int16 PCM full scale to [-1, 1)
 
+try:
+    # Ahead-of-time build from build_tts_kernels.py: no JIT stall on first use.
+    # numba.pycc is deprecated, so the cached JIT kernel below is the fallback.
+    from ._tts_kernels import i16_to_f32 as _i16_to_f32
+except ImportError:
+    @njit('void(int16[::1], float32[::1])', parallel=True, fastmath=True, cache=True)
+    def _i16_to_f32(src, dst):
+        """Scale 16-bit PCM to float32 in [-1, 1) in a single parallel pass."""
+        for i in prange(src.size):
+            dst[i] = src[i] * _INT16_TO_F32  # Frozen into the kernel as a constant
+
+# Define espeak structures
 class EspeakVoice(Structure):
     _fields_ = [
         ("name", c_char_p),
@@ -32,6 +49,36 @@ class EspeakVoice(Structure):
         ("variant", c_int),
     ]
 
+class EspeakEventId(Union):
+    _fields_ = [
+        ("number", c_int),
+        ("name", c_char_p),
+        ("string", c_char * 8),
+    ]
+
+class EspeakEvent(Structure):
+    _fields_ = [
+        ("type", c_int),
+        ("unique_identifier", c_uint),
+        ("text_position", c_int),
+        ("length", c_int),
+        ("audio_position", c_int),  # Milliseconds from the start of synthesis
+        ("sample", c_int),
+        ("user_data", c_void_p),
+        ("id", EspeakEventId),
+    ]
+
+class SynthJob:
+    """One utterance queued for the synthesis worker."""
+    __slots__ = ('text', 'flags', 'parts', 'done', 'audio')
+
+    def __init__(self, text: str, flags: c_int, parts: int = 0, done: Optional[Event] = None):
+        self.text = text
+        self.flags = flags
+        self.parts = parts  # Number of marked texts to split the audio into, 0 for none
+        self.done = done  # Set once the audio is queued for playback (or failed)
+        self.audio = None
+
 class TextToSpeech:
     # Load espeak-ng library
     if platform.system().lower() == "windows":
@@ -62,17 +109,34 @@ class TextToSpeech:
     _lib.espeak_SetVoiceByName.argtypes = [c_char_p]
     _lib.espeak_SetVoiceByName.restype = c_int
     
-    _lib.espeak_Synth.argtypes = [c_void_p, c_int, c_int, c_int, c_int, c_int, POINTER(c_int), c_void_p]
+    _lib.espeak_Synth.argtypes = [c_void_p, c_int, c_int, c_int, c_int, c_int, POINTER(c_uint), c_void_p]
     _lib.espeak_Synth.restype = c_int
     
     _lib.espeak_SetParameter.argtypes = [c_int, c_int, c_int]
     _lib.espeak_SetParameter.restype = c_int
     
+    _lib.espeak_Terminate.argtypes = []
+    _lib.espeak_Terminate.restype = c_int
+    
     _lib.espeak_ListVoices.argtypes = [POINTER(EspeakVoice)]
     _lib.espeak_ListVoices.restype = POINTER(POINTER(EspeakVoice))
+    
+    # int SynthCallback(short *wav, int numsamples, espeak_EVENT *events)
+    SYNTH_CALLBACK = CFUNCTYPE(c_int, POINTER(c_short), c_int, POINTER(EspeakEvent))
+    _lib.espeak_SetSynthCallback.argtypes = [SYNTH_CALLBACK]
+    _lib.espeak_SetSynthCallback.restype = None
 
     # Constants
-    AUDIO_OUTPUT_RETRIEVAL = 2
+    AUDIO_OUTPUT_SYNCHRONOUS = 2  # Like retrieval, but espeak_Synth waits for all audio
+    PCM_INITIAL_BYTES = 1 << 16
+    CHARS_UTF8 = 1  # espeak_Synth flags
+    SSML = 0x10
+    EVENT_LIST_TERMINATED = 0  # espeak_EVENT_TYPE values
+    EVENT_MARK = 3
+    SENTENCE_BREAK = '<break time="150ms"/>'  # Pause between speak_many texts
+    RING_SAMPLES = 1 << 20  # Playback ring capacity; must be a power of two
+    WORKER_POLL = 0.5  # Seconds between worker liveness checks while waiting on synthesis
+    DRAIN_SLACK = 2.0  # Seconds allowed beyond the queued audio's duration for playback
     RATE_MINIMUM = 80
     RATE_MAXIMUM = 450
     VOLUME_MINIMUM = 0
@@ -89,37 +153,103 @@ class TextToSpeech:
         tts_config = config.get('tts')
         audio_config = config.get('audio')
         
-        self.voice = tts_config['voice']
-        self.rate = min(max(tts_config['rate'], self.RATE_MINIMUM), self.RATE_MAXIMUM)
+        self.voice = tts_config.voice
+        self.rate = min(max(tts_config.rate, self.RATE_MINIMUM), self.RATE_MAXIMUM)
         # Convert 0-1 volume to espeak's 0-200 range
-        self.volume = int(min(max(tts_config['volume'], 0), 1) * 200)
-        self.sample_rate = audio_config['sample_rate']
+        self.volume = int(min(max(tts_config.volume, 0), 1) * 200)
+        self.sample_rate = audio_config.sample_rate
+        self.worker_core = tts_config.worker_core
+        self._voice_b = self.voice.encode()  # Encoded once for espeak_SetVoiceByName
         
         self.lock = Lock()
-        self.temp_dir = tempfile.mkdtemp(prefix='tts_')
+        
+        # espeak_Synth arguments, created once and reused for every call
+        self._flags = c_int(0)  # No special flags
+        self._ssml_flags = c_int(self.CHARS_UTF8 | self.SSML)  # For speak_many
+        self._position = c_int(0)  # Start position
+        self._position_type = c_int(0)  # Position type (0 = character)
+        self._end_position = c_int(0)  # End position (0 = until end)
+        self._unique_identifier = c_uint(0)  # Unique identifier for callback
+        self._unique_identifier_ref = ctypes.byref(self._unique_identifier)  # Lighter than a pointer
+        self._user_data = c_void_p(None)  # User data for callback
+        
+        # PCM gathered by the synth callback, reused and grown by doubling.
+        # Keep a reference to the ctypes callback so it isn't collected.
+        self._pcm = bytearray(self.PCM_INITIAL_BYTES)
+        self._pcm_len = 0
+        self._marks: List[int] = []  # <mark> audio positions (ms) from the last synthesis
+        self._synth_callback = self.SYNTH_CALLBACK(self._on_synth)
+        self._fbuf = np.empty(0, dtype=np.float32)  # Pooled float output, see _convert
+        self._voices_cache: Optional[Dict[str, Dict[str, str]]] = None
+        
+        # Single-producer/single-consumer sample ring feeding one long-lived
+        # output stream. Only the synthesis worker advances _write_idx and only
+        # the stream callback advances _read_idx, so neither side locks; the
+        # Events just wake a producer waiting for space or a caller waiting
+        # for playback.
+        self._ring = np.zeros(self.RING_SAMPLES, dtype=np.float32)
+        self._ring_mask = self.RING_SAMPLES - 1
+        self._write_idx = 0
+        self._read_idx = 0
+        self._space = Event()
+        self._drained = Event()
+        self._drained.set()
+        self.latency = audio_config.latency
         
         # Initialize espeak-ng
         self._initialize_espeak()
         
+        # Open the stream once, at espeak's sample rate, instead of per utterance
+        self._stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype=np.float32,
+            latency=self.latency,
+            callback=self._pa_callback
+        )
+        self._stream.start()
+        
+        # Synthesis worker: the ring's only producer. Callers queue SynthJobs,
+        # so synthesizing one utterance overlaps playback of the previous one.
+        self._jobs: "queue.Queue[Optional[SynthJob]]" = queue.Queue()
+        self._closed = False  # Set by cleanup(); later calls fail instead of queueing
+        self._worker = threading.Thread(target=self._synth_loop, name="tts-synth", daemon=True)
+        self._worker.start()
+        
     def _initialize_espeak(self) -> None:
         """Initialize espeak-ng library."""
         try:
-            # Initialize with output mode for audio retrieval
-            result = self._lib.espeak_Initialize(
-                self.AUDIO_OUTPUT_RETRIEVAL,  # Output mode
-                0,  # Buffer length (0 = default)
-                None,  # Path to espeak-data (None = default)
-                0  # Options (0 = default)
-            )
-            if result < 0:
-                raise Exception("Failed to initialize espeak-ng")
+            if _espeak_cy is not None:
+                # Registers its own PCM callback; returns the output sample rate
+                result = _espeak_cy.initialize()
+                if result < 0:
+                    raise Exception("Failed to initialize espeak-ng")
+                self.sample_rate = result
+            else:
+                # Synchronous mode hands PCM to the synth callback; the return
+                # value is the output sample rate
+                result = self._lib.espeak_Initialize(
+                    self.AUDIO_OUTPUT_SYNCHRONOUS,  # Output mode
+                    0,  # Buffer length (0 = default)
+                    None,  # Path to espeak-data (None = default)
+                    0  # Options (0 = default)
+                )
+                if result < 0:
+                    raise Exception("Failed to initialize espeak-ng")
+                self.sample_rate = result
+                self._lib.espeak_SetSynthCallback(self._synth_callback)
 
             # Set voice
-            result = self._lib.espeak_SetVoiceByName(self.voice.encode())
+            result = self._lib.espeak_SetVoiceByName(self._voice_b)
             if result < 0:
                 raise Exception(f"Failed to set voice: {self.voice}")
+            
+            # Apply the configured rate and volume, which the update_* no-op
+            # checks assume espeak already has
+            self._lib.espeak_SetParameter(self.RATE, self.rate, 0)
+            self._lib.espeak_SetParameter(self.VOLUME, self.volume, 0)
 
-            print(f"Initialized eSpeak-NG with voice: {self.voice}")
+            logger.info("Initialized eSpeak-NG with voice: %s", self.voice)
             
         except Exception as e:
             if platform.system().lower() == "windows":
@@ -139,96 +269,298 @@ class TextToSpeech:
         """
         Convert text to speech and play it.
         
+        Synthesis runs on the worker thread, so non-blocking calls return
+        immediately and queued utterances play back to back.
+        
         Args:
             text: Text to convert to speech
             blocking: Whether to block until audio finishes playing
             
         Returns:
-            np.ndarray: Audio data if successful, None otherwise
+            np.ndarray: Audio data if blocking and successful, None otherwise.
+                It views a reused buffer, so it is only valid until the next
+                utterance is synthesized.
         """
         if not text:
-            print("Empty text provided to TTS")
+            logger.warning("Empty text provided to TTS")
             return None
             
-        with self.lock:
-            try:
-                # Prepare text
-                text_bytes = text.encode('utf-8')
-                text_length = len(text_bytes)
-                
-                # Prepare audio buffer structure
-                audio_data = SpeakAudioStruct()
-                audio_data.data = None
-                audio_data.length = 0
-                audio_data.sampling_rate = self.sample_rate
-                
-                # Set synthesis parameters
-                flags = c_int(0)  # No special flags
-                position = c_int(0)  # Start position
-                position_type = c_int(0)  # Position type (0 = character)
-                end_position = c_int(0)  # End position (0 = until end)
-                unique_identifier = c_int(0)  # Unique identifier for callback
-                user_data = c_void_p(None)  # User data for callback
-                
-                # Synthesize speech
-                result = self._lib.espeak_Synth(
-                    text_bytes,  # Text
-                    text_length,  # Text length
-                    position,  # Position
-                    position_type,  # Position type
-                    end_position,  # End position
-                    flags,  # Flags
-                    POINTER(c_int)(unique_identifier),  # Unique identifier
-                    user_data  # User data
-                )
-                
-                if result < 0:
-                    raise Exception("Speech synthesis failed")
+        return self._submit(SynthJob(text, self._flags), blocking)
+
+    def speak_many(self, texts: List[str], blocking: bool = True) -> Optional[List[np.ndarray]]:
+        """
+        Speak several texts with a single synthesis call.
+        
+        The texts are joined into one SSML document with a short break between
+        them and a <mark> before each, so the audio can be split back apart.
+        
+        Args:
+            texts: Texts to speak, in order
+            blocking: Whether to block until audio finishes playing
+            
+        Returns:
+            List[np.ndarray]: Audio for each text if blocking and successful,
+                None otherwise. The arrays view a reused buffer, so they are
+                only valid until the next utterance is synthesized.
+        """
+        texts = [text for text in texts if text]
+        if not texts:
+            logger.warning("Empty text provided to TTS")
+            return None
+            
+        ssml = "<speak>" + self.SENTENCE_BREAK.join(
+            f'<mark name="{i}"/>{escape(text)}' for i, text in enumerate(texts)
+        ) + "</speak>"
+        
+        return self._submit(SynthJob(ssml, self._ssml_flags, len(texts)), blocking)
+
+    def _submit(self, job: SynthJob, blocking: bool):
+        """Queue a job for the worker; if blocking, wait until it has played."""
+        if self._closed:
+            raise RuntimeError("TextToSpeech has been cleaned up")
+        if not self._worker.is_alive() or not self._stream.active:
+            raise RuntimeError("TTS worker or output stream is not running")
+        if blocking:
+            job.done = Event()
+        self._jobs.put(job)
+        if not blocking:
+            return None
+            
+        # Synthesis time isn't known up front, so wait in slices and give up
+        # if the worker has died rather than blocking forever
+        while not job.done.wait(self.WORKER_POLL):
+            if not self._worker.is_alive():
+                raise RuntimeError("TTS worker stopped before synthesizing the utterance")
+        if job.audio is not None:
+            self._wait_drained()
+        return job.audio
+
+    def _wait_drained(self) -> None:
+        """Wait for the ring to play out, bounded by the duration of what is queued."""
+        while True:
+            read_idx = self._read_idx
+            timeout = (self._write_idx - read_idx) / self.sample_rate + self.DRAIN_SLACK
+            if self._drained.wait(timeout):
+                return
+            # More audio may have been queued meanwhile; only give up if none played
+            if not self._stream.active or self._read_idx == read_idx:
+                raise RuntimeError("TTS playback stalled")
+
+    def _synth_loop(self) -> None:
+        """Worker thread: synthesize queued jobs and feed the playback ring."""
+        if self.worker_core is not None:
+            self._pin_worker(self.worker_core)
+            
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break  # Shutdown sentinel from cleanup()
                 
-                # Get the synthesized audio data
-                audio_array = np.ctypeslib.as_array(
-                    audio_data.data,
-                    shape=(audio_data.length,)
-                )
+            try:
+                with self.lock:
+                    audio_array = self._synthesize(job.text, job.flags)
+                    audio_float = self._convert(audio_array)
+                    audio = self._split_at_marks(audio_float, job.parts) if job.parts else audio_float
                 
-                # Convert to float32 and normalize
-                audio_float = audio_array.astype(np.float32) / 32768.0
+                # Outside the lock: this may wait for ring space while playing
+                self._enqueue(audio_float)
+                job.audio = audio
                 
-                # Play the audio
-                if blocking:
-                    sd.play(audio_float, self.sample_rate)
-                    sd.wait()
-                else:
-                    sd.play(audio_float, self.sample_rate)
+            except Exception as e:
+                logger.error("TTS error: %s", e)
+            finally:
+                if job.done is not None:
+                    job.done.set()
+
+    def _pin_worker(self, core: int) -> None:
+        """Bind the calling (worker) thread to one CPU core."""
+        try:
+            if hasattr(os, 'sched_setaffinity'):
+                os.sched_setaffinity(0, {core})  # pid 0 is the calling thread
+            elif platform.system().lower() == "windows":
+                kernel32 = ctypes.windll.kernel32
+                kernel32.GetCurrentThread.restype = c_void_p
+                kernel32.SetThreadAffinityMask.argtypes = [c_void_p, ctypes.c_size_t]
+                kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+                if not kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), 1 << core):
+                    raise ctypes.WinError()
+            else:
+                logger.warning("TTS worker core pinning is not supported on this platform")
+        except Exception as e:
+            logger.warning("Could not pin TTS worker to core %d: %s", core, e)
+
+    def _split_at_marks(self, audio_float: np.ndarray, parts: int) -> List[np.ndarray]:
+        """Split synthesized audio into per-text views at the recorded marks."""
+        # Marks are in milliseconds; each text runs up to the next mark
+        bounds = [
+            min(audio_float.size, ms * self.sample_rate // 1000)
+            for ms in self._marks[1:parts]
+        ]
+        bounds += [audio_float.size] * (parts - 1 - len(bounds))  # Missing marks
+        starts = [0] + bounds
+        ends = bounds + [audio_float.size]
+        return [audio_float[start:end] for start, end in zip(starts, ends)]
+
+    def _synthesize(self, text: str, flags: c_int) -> np.ndarray:
+        """Synthesize text into int16 samples, recording any <mark> positions."""
+        if _espeak_cy is not None:
+            # Takes the str directly, reading its UTF-8 without a bytes copy
+            samples = _espeak_cy.synth(text, flags.value)
+            if samples is None:
+                raise Exception("Speech synthesis failed")
+            self._marks = _espeak_cy.marks()
+            # Views the extension's buffer; the float conversion in _convert copies
+            return np.frombuffer(samples, dtype=np.int16)
+            
+        self._pcm_len = 0
+        self._marks = []
+        text_bytes = text.encode('utf-8')
+        
+        # Synthesize speech
+        result = self._lib.espeak_Synth(
+            text_bytes,  # Text
+            len(text_bytes),  # Text length
+            self._position,  # Position
+            self._position_type,  # Position type
+            self._end_position,  # End position
+            flags,  # Flags
+            self._unique_identifier_ref,  # Unique identifier
+            self._user_data  # User data
+        )
+        
+        if result != 0:  # EE_OK
+            raise Exception("Speech synthesis failed")
+        
+        # View the PCM the callback gathered; _convert copies it
+        return np.frombuffer(self._pcm, dtype=np.int16, count=self._pcm_len // 2)
+
+    def _on_synth(self, wav, numsamples: int, events) -> int:
+        """espeak SynthCallback: append a chunk of PCM to the reused buffer."""
+        if events:
+            i = 0
+            while events[i].type != self.EVENT_LIST_TERMINATED:
+                if events[i].type == self.EVENT_MARK:
+                    self._marks.append(events[i].audio_position)
+                i += 1
                 
-                return audio_float
+        if not wav or numsamples <= 0:
+            return 0  # End of synthesis
+            
+        nbytes = numsamples * 2
+        needed = self._pcm_len + nbytes
+        if needed > len(self._pcm):
+            # Replace rather than resize, so a live view of the old buffer
+            # can't make the resize fail
+            grown = bytearray(max(needed, 2 * len(self._pcm)))
+            grown[:self._pcm_len] = memoryview(self._pcm)[:self._pcm_len]
+            self._pcm = grown
+            
+        dest = (c_char * nbytes).from_buffer(self._pcm, self._pcm_len)
+        ctypes.memmove(dest, wav, nbytes)
+        self._pcm_len = needed
+        return 0  # Continue synthesis
+
+    def _convert(self, audio_array: np.ndarray) -> np.ndarray:
+        """Convert int16 samples to float32 in the pooled buffer."""
+        n = audio_array.size
+        if n == 0:
+            # Empty Cython output is a readonly view, which the compiled
+            # kernel's signature rejects; there is nothing to convert anyway
+            return self._fbuf[:0]
+        if n > self._fbuf.size:
+            self._fbuf = np.empty(max(n, 2 * self._fbuf.size), dtype=np.float32)
+            
+        # Convert to float32 and normalize in one compiled pass
+        audio_float = self._fbuf[:n]
+        _i16_to_f32(audio_array, audio_float)
+        return audio_float
+
+    def _enqueue(self, samples: np.ndarray) -> None:
+        """Copy samples into the playback ring, waiting for space if it is full.
+        
+        Only the synthesis worker calls this, keeping the ring single-producer.
+        """
+        offset = 0
+        total = samples.size
+        while offset < total:
+            write_idx = self._write_idx
+            free = self.RING_SAMPLES - (write_idx - self._read_idx)
+            if free == 0:
+                self._space.clear()
+                # Recheck after clearing so space freed in between isn't missed
+                if self.RING_SAMPLES - (write_idx - self._read_idx) == 0:
+                    # A stopped stream never frees space; don't wedge the worker
+                    if not self._space.wait(self.WORKER_POLL) and not self._stream.active:
+                        raise RuntimeError("TTS output stream stopped")
+                continue
                 
-            except Exception as e:
-                print(f"TTS error: {str(e)}")
-                return None
+            count = min(free, total - offset)
+            start = write_idx & self._ring_mask
+            head = min(count, self.RING_SAMPLES - start)
+            self._ring[start:start + head] = samples[offset:offset + head]
+            if head < count:
+                self._ring[:count - head] = samples[offset + head:offset + count]
+            
+            self._write_idx = write_idx + count  # Publish only once copied
+            # Clear after publishing: if the callback drains the ring first, it
+            # sets the event again on its next run, so a waiter can't miss it
+            self._drained.clear()
+            offset += count
+
+    def _pa_callback(self, outdata, frames, time, status):
+        """Output stream callback: copy queued samples out, silence when idle."""
+        out = outdata[:, 0]
+        read_idx = self._read_idx
+        count = min(frames, self._write_idx - read_idx)
+        if count:
+            start = read_idx & self._ring_mask
+            head = min(count, self.RING_SAMPLES - start)
+            out[:head] = self._ring[start:start + head]
+            if head < count:
+                out[head:count] = self._ring[:count - head]
+            self._read_idx = read_idx + count
+            self._space.set()
+        out[count:] = 0.0
+        
+        if self._read_idx == self._write_idx:
+            self._drained.set()
 
     def update_voice(self, voice: str) -> None:
         """Update the TTS voice."""
         with self.lock:
-            result = self._lib.espeak_SetVoiceByName(voice.encode())
+            if voice == self.voice:
+                return  # Already set; skip the ctypes call
+            voice_b = voice.encode()
+            result = self._lib.espeak_SetVoiceByName(voice_b)
             if result < 0:
                 raise Exception(f"Failed to set voice: {voice}")
             self.voice = voice
+            self._voice_b = voice_b
             
     def update_rate(self, rate: int) -> None:
         """Update the speech rate."""
         with self.lock:
-            self.rate = min(max(rate, self.RATE_MINIMUM), self.RATE_MAXIMUM)
-            self._lib.espeak_SetParameter(3, self.rate, 0)  # 3 is rate parameter
+            rate = min(max(rate, self.RATE_MINIMUM), self.RATE_MAXIMUM)
+            if rate == self.rate:
+                return  # Already set; skip the ctypes call
+            self.rate = rate
+            self._lib.espeak_SetParameter(self.RATE, self.rate, 0)
             
     def update_volume(self, volume: float) -> None:
         """Update the speech volume (0-1)."""
         with self.lock:
-            self.volume = int(min(max(volume, 0), 1) * 200)
-            self._lib.espeak_SetParameter(1, self.volume, 0)  # 1 is volume parameter
+            volume = int(min(max(volume, 0), 1) * 200)
+            if volume == self.volume:
+                return  # Already set; skip the ctypes call
+            self.volume = volume
+            self._lib.espeak_SetParameter(self.VOLUME, self.volume, 0)
             
     def get_available_voices(self) -> Dict[str, Dict[str, str]]:
         """Get list of available espeak-ng voices with details."""
+        # Voices don't change once espeak is loaded, so walk the list only once
+        if self._voices_cache is not None:
+            return self._voices_cache
+            
         voices = {}
         try:
             voice_list = self._lib.espeak_ListVoices(None)
@@ -247,18 +579,31 @@ class TextToSpeech:
                     'age': str(voice.age) if voice.age else ''
                 }
                 index += 1
+            self._voices_cache = voices
                 
         except Exception as e:
-            print(f"Error getting voices: {str(e)}")
+            logger.error("Error getting voices: %s", e)
             
         return voices
             
     def cleanup(self) -> None:
         """Clean up resources."""
+        self._closed = True
+        self._jobs.put(None)  # Stop the worker after anything already queued
+        self._worker.join(timeout=1.0)
+        
         try:
-            shutil.rmtree(self.temp_dir)
+            self._stream.stop()
+            self._stream.close()
         except Exception as e:
-            print(f"Error cleaning up TTS temp directory: {str(e)}")
+            logger.error("Error closing TTS output stream: %s", e)
+        self._drained.set()  # Release any caller still waiting on playback
+        
+        with self.lock:
+            try:
+                self._lib.espeak_Terminate()
+            except Exception as e:
+                logger.error("Error terminating eSpeak-NG: %s", e)
             
     def __enter__(self):
         """Context manager entry."""
@@ -10,19 +10,65 @@ function handleUserInput() {
         method: "POST",
         headers: {
             "Content-Type": "application/json",
+            "Accept": "text/event-stream",
         },
         body: JSON.stringify({ message }),
     })
-    .then((res) => res.json())
-    .then((data) => {
-        chatbox.innerHTML += `<div><b>Jarvis:</b> ${data.response}</div>`;
-        if (message.startsWith("remember: ")) {
-            chatbox.innerHTML += `<div><b>System:</b> Memory stored: ${message.slice(9).trim('"')}</div>`;
+    .then((res) => {
+        // Answers are streamed; commands like "remember: " still reply with JSON
+        const contentType = res.headers.get("Content-Type") || "";
+        if (contentType.startsWith("text/event-stream")) {
+            return streamResponse(res, chatbox);
         }
-        chatbox.scrollTop = chatbox.scrollHeight;
+        return res.json().then((data) => {
+            chatbox.innerHTML += `<div><b>Jarvis:</b> ${data.response}</div>`;
+            if (message.startsWith("remember: ")) {
+                chatbox.innerHTML += `<div><b>System:</b> Memory stored: ${message.slice(9).trim('"')}</div>`;
+            }
+            chatbox.scrollTop = chatbox.scrollHeight;
+        });
     });
 }
 
+function streamResponse(res, chatbox) {
+    const reply = document.createElement("div");
+    reply.innerHTML = "<b>Jarvis:</b> ";
+    const text = document.createElement("span");
+    reply.appendChild(text);
+    chatbox.appendChild(reply);
+
+    // EventSource only supports GET, so parse the SSE stream from fetch directly
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    function read() {
+        return reader.read().then(({ done, value }) => {
+            if (done) return;
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split("\n\n");
+            buffer = events.pop();
+            for (const rawEvent of events) {
+                let event = "message";
+                const data = [];
+                for (const line of rawEvent.split("\n")) {
+                    if (line.startsWith("event: ")) {
+                        event = line.slice(7);
+                    } else if (line.startsWith("data: ")) {
+                        data.push(line.slice(6));
+                    }
+                }
+                if (event === "message" || event === "error") {
+                    text.textContent += data.join("\n");
+                }
+            }
+            chatbox.scrollTop = chatbox.scrollHeight;
+            return read();
+        });
+    }
+    return read();
+}
+
 function resetMemory() {
     fetch("/reset", {
         method: "POST",